@@ -1,20 +1,84 @@
 import json
 import os
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Set, Tuple
 import re
 
+def keyword_overlap_score(query_words: Set[str], chunk_words: Set[str]) -> float:
+    """Count of query words that also appear in the chunk"""
+    return len(query_words.intersection(chunk_words))
+
+def jaccard_score(query_words: Set[str], chunk_words: Set[str]) -> float:
+    """Keyword overlap normalized by the size of both word sets"""
+    union = query_words.union(chunk_words)
+    if not union:
+        return 0
+    return len(query_words.intersection(chunk_words)) / len(union)
+
+# Scoring functions available to get_relevant_chunks, keyed by name
+SCORERS: Dict[str, Callable[[Set[str], Set[str]], float]] = {
+    "keyword": keyword_overlap_score,
+    "jaccard": jaccard_score,
+}
+
+QUERY_SYSTEM_PROMPT = "You are a helpful assistant that answers questions about beauty salon services based on provided website content."
+
+def build_query_prompt(query: str, chunks: List[Dict]) -> str:
+    """
+    Build the user prompt sent for a chunk-based query
+    """
+    context = "\n\n".join([chunk["content"] for chunk in chunks])
+    
+    return f"""Based on the following information from a beauty salon website, please answer the user's question.
+
+Website Information:
+{context}
+
+User Question: {query}
+
+Please provide a helpful and accurate answer based only on the information provided above."""
+
 class ContentStore:
     """
     Advanced content storage system with chunking and persistence
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", chunk_size: int = 1000,
+                 chunk_overlap: int = 200, scorer: str = "keyword"):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if chunk_overlap < 0:
+            raise ValueError("chunk_overlap cannot be negative")
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        if scorer not in SCORERS:
+            raise ValueError(f"Unknown scorer '{scorer}', expected one of: {', '.join(SCORERS)}")
         self.data_dir = data_dir
         self.storage_file = os.path.join(data_dir, "scraped_content.json")
-        self.chunk_size = 1000
-        self.chunk_overlap = 200
-        self._ensure_data_dir()
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.scorer = scorer
+        # Parsed storage file, loaded on first use or by warm_up() and
+        # re-read when its mtime/size show another process changed it
+        self._data: Optional[Dict] = None
+        self._data_signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+        
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the storage file has been parsed into memory"""
+        return self._data is not None
+        
+    def warm_up(self) -> Dict:
+        """
+        Load the storage file into memory ahead of the first query
+        """
+        data = self._load_data()
+        return {
+            "urls_loaded": len(data),
+            "chunks_loaded": sum(item["chunks_count"] for item in data.values())
+        }
         
     def _ensure_data_dir(self):
         """Ensure data directory exists"""
@@ -44,8 +108,9 @@ class ContentStore:
             
             # If this isn't the last chunk, try to break at sentence boundary
             if end < len(text):
-                # Look for sentence endings within the last 200 characters
-                search_start = max(start + self.chunk_size - 200, start)
+                # Look for sentence endings within the last 200 characters,
+                # but never so early that the overlap would stop us advancing
+                search_start = max(start + self.chunk_size - 200, start + self.chunk_overlap + 1)
                 sentence_end = self._find_sentence_boundary(text, search_start, end)
                 if sentence_end > start:
                     end = sentence_end
@@ -156,12 +221,13 @@ class ContentStore:
             
         chunks = content_data["chunks"]
         query_words = set(query.lower().split())
+        score_fn = SCORERS[self.scorer]
         
         # Score chunks based on keyword overlap
         scored_chunks = []
         for chunk in chunks:
             chunk_words = set(chunk["content"].lower().split())
-            score = len(query_words.intersection(chunk_words))
+            score = score_fn(query_words, chunk_words)
             if score > 0:
                 scored_chunks.append((score, chunk))
         
@@ -241,24 +307,55 @@ class ContentStore:
             "urls": urls_info
         }
     
-    def _load_data(self) -> Dict:
-        """Load data from storage file"""
-        if not os.path.exists(self.storage_file):
-            return {}
-            
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the storage file, None if it doesn't exist"""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+            stat = os.stat(self.storage_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _load_data(self) -> Dict:
+        """Load data from storage file, parsing it again only when it has changed"""
+        with self._lock:
+            signature = self._file_signature()
+            if self._data is not None and signature == self._data_signature:
+                return self._data
+                
+            if signature is None:
+                self._data = {}
+            else:
+                try:
+                    with open(self.storage_file, 'r', encoding='utf-8') as f:
+                        self._data = json.load(f)
+                except (json.JSONDecodeError, FileNotFoundError):
+                    self._data = {}
+            self._data_signature = signature
+            return self._data
     
     def _save_data(self, data: Dict):
         """Save data to storage file"""
+        # Write to a temporary file and swap it in, so other processes
+        # re-reading the file never see a partial write
+        temp_file = f"{self.storage_file}.{os.getpid()}.tmp"
         try:
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
+            self._ensure_data_dir()
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.storage_file)
         except Exception as e:
             print(f"Error saving data: {e}")
+            # Drop the cache so the next call reloads what is actually on disk
+            with self._lock:
+                self._data = None
+                self._data_signature = None
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            return
+            
+        with self._lock:
+            self._data = data
+            self._data_signature = self._file_signature()
 
 # Global instance
 content_store = ContentStore() 
\ No newline at end of file
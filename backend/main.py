@@ -1,16 +1,18 @@
+import time
+
+# Startup is measured from the app import, so the budget covers our own imports
+# but not interpreter boot or the server's (e.g. uvicorn's) imports
+_IMPORT_START = time.perf_counter()
+
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from dotenv import load_dotenv
-import openai
-import requests
-from bs4 import BeautifulSoup
-import asyncio
-import aiohttp
-from content_store import content_store
+from content_store import content_store, build_query_prompt, QUERY_SYSTEM_PROMPT
 from urllib.parse import urljoin, urlparse
-import time
 
 # Load environment variables
 load_dotenv()
@@ -23,11 +25,59 @@ if not OPENAI_API_KEY:
     print("   export OPENAI_API_KEY='sk-your-api-key-here'")
     print("   or add to .env file: OPENAI_API_KEY=sk-your-api-key-here")
 
+# Seconds from the app import until it accepts requests
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "2.0"))
+
+# Startup timings and readiness, filled in by the lifespan hook
+startup_state = {
+    "ready": False,
+    "startup_seconds": None,
+    "warmup_seconds": None,
+    "warmup_error": None,
+    "index": None
+}
+
+def require_ready():
+    """
+    Reject store-backed requests until the warm-up has loaded the index, so
+    they never wait on the loading thread from the event loop
+    """
+    if startup_state["warmup_error"]:
+        raise HTTPException(status_code=503, detail=f"Content index failed to load: {startup_state['warmup_error']}")
+    if not startup_state["ready"]:
+        raise HTTPException(status_code=503, detail="Content index still loading")
+
+async def warm_up_content_store():
+    """Load the stored content index in the background"""
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        startup_state["index"] = await loop.run_in_executor(None, content_store.warm_up)
+        startup_state["ready"] = True
+        print(f"🔥 Content index loaded: {startup_state['index']['urls_loaded']} URLs, {startup_state['index']['chunks_loaded']} chunks")
+    except Exception as e:
+        startup_state["warmup_error"] = str(e)
+        print(f"❌ Failed to load content index: {str(e)}")
+    finally:
+        startup_state["warmup_seconds"] = time.perf_counter() - start
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start index warm-up without blocking the server from accepting requests"""
+    startup_state.update(ready=False, warmup_seconds=None, warmup_error=None, index=None)
+    startup_state["startup_seconds"] = time.perf_counter() - _IMPORT_START
+    if startup_state["startup_seconds"] > STARTUP_BUDGET_SECONDS:
+        print(f"⚠️ Startup took {startup_state['startup_seconds']:.2f}s, over the {STARTUP_BUDGET_SECONDS:.2f}s budget")
+    warmup_task = asyncio.create_task(warm_up_content_store())
+    yield
+    warmup_task.cancel()
+
 # Create FastAPI application
 app = FastAPI(
     title="AI Salon Q&A Assistant", 
     description="Advanced AI-powered Q&A system for beauty salon websites", 
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -39,11 +89,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize OpenAI client
-if OPENAI_API_KEY:
-    openai.api_key = OPENAI_API_KEY
-else:
-    openai.api_key = None
+_openai = None
+
+def get_openai():
+    """Import and configure the OpenAI client on first use"""
+    global _openai
+    if _openai is None:
+        import openai
+        openai.api_key = OPENAI_API_KEY or None
+        _openai = openai
+    return _openai
 
 # Data models
 class ChatRequest(BaseModel):
@@ -81,6 +136,9 @@ def extract_links(soup, base_url):
 
 def scrape_single_page(url, headers):
     """Scrape content from a single page"""
+    import requests
+    from bs4 import BeautifulSoup
+    
     try:
         print(f"  📄 Scraping: {url}")
         response = requests.get(url, headers=headers, timeout=10)
@@ -117,19 +175,53 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    stats = content_store.get_storage_stats()
+    # Don't block on the storage file while the warm-up is still loading it
+    stats = content_store.get_storage_stats() if startup_state["ready"] else None
+    if startup_state["warmup_error"]:
+        status = "unhealthy"
+        message = f"Content index failed to load: {startup_state['warmup_error']}"
+    elif startup_state["ready"]:
+        status = "healthy"
+        message = "Service running normally"
+    else:
+        status = "starting"
+        message = "Service starting, content index loading"
     return {
-        "status": "healthy",
-        "message": "Service running normally",
+        "status": status,
+        "message": message,
+        "live": True,
+        "ready": startup_state["ready"],
         "api_key_configured": bool(OPENAI_API_KEY),
+        "startup": {
+            "startup_seconds": startup_state["startup_seconds"],
+            "budget_seconds": STARTUP_BUDGET_SECONDS,
+            "within_budget": startup_state["startup_seconds"] is not None and startup_state["startup_seconds"] <= STARTUP_BUDGET_SECONDS,
+            "warmup_seconds": startup_state["warmup_seconds"],
+            "warmup_error": startup_state["warmup_error"],
+            "index": startup_state["index"]
+        },
         "storage_stats": stats
     }
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: the content index has been loaded"""
+    require_ready()
+    return {"status": "ready", "index": startup_state["index"]}
+
 @app.post("/scrape-website")
 async def scrape_website(req: ScrapeRequest):
     """
     Scrape website content with multi-page analysis
     """
+    require_ready()
+    import requests
+    
     try:
         # Validate URL
         if not req.url.startswith(('http://', 'https://')):
@@ -204,6 +296,8 @@ async def add_text_content(req: TextContentRequest):
     """
     Add text content directly to the vector database
     """
+    require_ready()
+    
     try:
         # Validate content
         if not req.content.strip():
@@ -235,6 +329,7 @@ async def add_text_content(req: TextContentRequest):
 @app.get("/scraping-status")
 async def get_scraping_status():
     """Get current scraping status and storage statistics"""
+    require_ready()
     stats = content_store.get_storage_stats()
     
     if stats["total_urls"] == 0:
@@ -260,12 +355,15 @@ async def chat_api(req: ChatRequest):
     """
     Enhanced AI chat interface with intelligent content retrieval
     """
-    if not openai.api_key:
+    if not OPENAI_API_KEY:
         raise HTTPException(
             status_code=500, 
             detail="OpenAI API key not configured. Please set OPENAI_API_KEY environment variable."
         )
     
+    require_ready()
+    openai = get_openai()
+    
     try:
         # Get the user's latest message
         user_message = ""
@@ -332,9 +430,12 @@ async def intelligent_query(req: QueryRequest):
     """
     Intelligent query endpoint using relevant chunk retrieval
     """
-    if not openai.api_key:
+    if not OPENAI_API_KEY:
         raise HTTPException(status_code=500, detail="OpenAI API key not configured")
     
+    require_ready()
+    openai = get_openai()
+    
     try:
         # Get relevant chunks for the query
         relevant_chunks = content_store.get_relevant_chunks(req.query, req.url, max_chunks=3)
@@ -345,23 +446,13 @@ async def intelligent_query(req: QueryRequest):
                 "chunks_used": 0
             }
         
-        # Combine relevant chunks
-        context = "\n\n".join([chunk["content"] for chunk in relevant_chunks])
-        
-        # Create focused prompt
-        prompt = f"""Based on the following information from a beauty salon website, please answer the user's question.
-
-Website Information:
-{context}
-
-User Question: {req.query}
-
-Please provide a helpful and accurate answer based only on the information provided above."""
+        # Create focused prompt from the relevant chunks
+        prompt = build_query_prompt(req.query, relevant_chunks)
 
         response = openai.ChatCompletion.create(
             model="gpt-3.5-turbo",
             messages=[
-                {"role": "system", "content": "You are a helpful assistant that answers questions about beauty salon services based on provided website content."},
+                {"role": "system", "content": QUERY_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.5,
@@ -383,6 +474,8 @@ Please provide a helpful and accurate answer based only on the information provi
 @app.delete("/reset")
 async def reset_content():
     """Clear all stored content"""
+    require_ready()
+    
     try:
         content_store.clear_content()
         print("🗑️ All content cleared")
@@ -394,11 +487,14 @@ async def reset_content():
 @app.get("/storage-stats")
 async def get_storage_statistics():
     """Get detailed storage statistics"""
+    require_ready()
     return content_store.get_storage_stats()
 
 @app.get("/content/{url:path}")
 async def get_content_by_url(url: str):
     """Get stored content for a specific URL"""
+    require_ready()
+    
     # Decode URL
     import urllib.parse
     decoded_url = urllib.parse.unquote(url)
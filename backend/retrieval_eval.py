@@ -0,0 +1,245 @@
+"""
+Offline evaluation of the chunk retrieval path used by the /query endpoint.
+
+Loads a corpus into a throwaway ContentStore for each configuration, runs every
+labeled question through get_relevant_chunks and reports hit@k, MRR, prompt
+tokens per query and retrieval latency, side by side.
+
+Usage:
+    python retrieval_eval.py corpus.json labels.json \\
+        --config chunk_size=1000,chunk_overlap=200,scorer=keyword \\
+        --config chunk_size=500,chunk_overlap=100,scorer=jaccard
+
+corpus.json maps a URL (or any document id) to its text:
+    {"https://salon.example": "Opening hours: ..."}
+
+labels.json is a list of questions with the answer span that must appear in a
+retrieved chunk, and/or the expected chunk ids for that document. "url" names the
+corpus document to search and is required when the corpus has more than one
+document. Labels that could only ever score a miss are rejected up front:
+    [{"question": "When do you open?", "url": "https://salon.example",
+      "answer": "Mon-Fri 9am-7pm", "chunk_ids": [0]}]
+"""
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from content_store import ContentStore, SCORERS, build_query_prompt, QUERY_SYSTEM_PROMPT
+
+DEFAULT_CONFIG = {"chunk_size": 1000, "chunk_overlap": 200, "scorer": "keyword"}
+
+_encoding = None
+_encoding_loaded = False
+
+def _get_encoding():
+    """Load the tiktoken encoding on first use, or None if it is unavailable"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            # May need to download the BPE file, so any failure falls back to the estimate
+            _encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        except Exception:
+            _encoding = None
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens, falling back to ~4 characters per token without tiktoken"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return (len(text) + 3) // 4
+
+def parse_config(spec: str) -> Dict:
+    """Parse a 'chunk_size=500,chunk_overlap=100,scorer=jaccard' style spec"""
+    config = dict(DEFAULT_CONFIG)
+    for item in filter(None, spec.split(",")):
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep or key not in DEFAULT_CONFIG:
+            raise ValueError(f"Invalid config entry '{item}', expected one of: {', '.join(DEFAULT_CONFIG)}")
+        config[key] = value.strip() if key == "scorer" else int(value)
+    return config
+
+def config_label(config: Dict) -> str:
+    return f"size={config['chunk_size']} overlap={config['chunk_overlap']} scorer={config['scorer']}"
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+def is_relevant(chunk: Dict, label: Dict) -> bool:
+    """
+    A chunk is relevant if it contains the labeled answer span or is one of the
+    labeled chunk ids. Answer spans survive changes to chunk_size/chunk_overlap,
+    chunk ids only make sense for the configuration they were labeled against.
+    """
+    answer = label.get("answer")
+    if answer and _normalize(answer) in _normalize(chunk["content"]):
+        return True
+    return chunk["chunk_id"] in label.get("chunk_ids", [])
+
+def _label_name(index: int, label: Dict) -> str:
+    return f"#{index} {label['question']!r}" if label.get("question") else f"#{index}"
+
+def validate_labels(corpus: Dict[str, str], labels: List[Dict]):
+    """
+    Raise ValueError for labels that would otherwise be scored as silent misses
+    """
+    problems = {
+        "missing 'question'": [
+            _label_name(i, label) for i, label in enumerate(labels) if not label.get("question")
+        ],
+        "missing both 'answer' and 'chunk_ids'": [
+            _label_name(i, label) for i, label in enumerate(labels)
+            if not label.get("answer") and not label.get("chunk_ids")
+        ],
+        "'url' not in corpus": [
+            _label_name(i, label) for i, label in enumerate(labels)
+            if label.get("url") and label["url"] not in corpus
+        ],
+    }
+    if len(corpus) > 1:
+        problems["'url' required when the corpus has more than one document"] = [
+            _label_name(i, label) for i, label in enumerate(labels) if not label.get("url")
+        ]
+
+    errors = [f"{problem}: {', '.join(names)}" for problem, names in problems.items() if names]
+    if errors:
+        raise ValueError("Invalid labels, " + "; ".join(errors))
+
+def evaluate_config(corpus: Dict[str, str], labels: List[Dict], config: Dict,
+                    ks: List[int], max_chunks: int = 3) -> Dict:
+    """
+    Run every labeled query against a fresh store built with the given config
+    """
+    validate_labels(corpus, labels)
+    if min(ks) < 1 or max_chunks < 1:
+        raise ValueError("k and max_chunks must be at least 1")
+
+    depth = max(max(ks), max_chunks)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = ContentStore(data_dir=data_dir, **config)
+        chunks_created = 0
+        for url, text in corpus.items():
+            chunks_created += store.store_content(url, text)["chunks_created"]
+
+        per_query = []
+        for label in labels:
+            start = time.perf_counter()
+            retrieved = store.get_relevant_chunks(label["question"], label.get("url"), max_chunks=depth)
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            first_hit = next(
+                (rank for rank, chunk in enumerate(retrieved, 1) if is_relevant(chunk, label)),
+                None
+            )
+            # Tokens for the same messages /query would send with max_chunks chunks,
+            # which answers without calling the model when nothing is retrieved
+            if retrieved:
+                prompt = build_query_prompt(label["question"], retrieved[:max_chunks])
+                prompt_tokens = count_tokens(QUERY_SYSTEM_PROMPT) + count_tokens(prompt)
+            else:
+                prompt_tokens = 0
+
+            per_query.append({
+                "question": label["question"],
+                "first_relevant_rank": first_hit,
+                "chunks_retrieved": len(retrieved),
+                "prompt_tokens": prompt_tokens,
+                "latency_ms": latency_ms
+            })
+
+    latencies = [q["latency_ms"] for q in per_query]
+    total = len(per_query) or 1
+    return {
+        "config": config,
+        "chunks_created": chunks_created,
+        "queries": len(per_query),
+        # Share of queries with at least one relevant chunk in the top k
+        "hit_at_k": {
+            k: sum(1 for q in per_query if q["first_relevant_rank"] and q["first_relevant_rank"] <= k) / total
+            for k in ks
+        },
+        "mrr": sum(1 / q["first_relevant_rank"] for q in per_query if q["first_relevant_rank"]) / total,
+        "mean_prompt_tokens": statistics.mean(q["prompt_tokens"] for q in per_query) if per_query else 0,
+        "mean_latency_ms": statistics.mean(latencies) if latencies else 0,
+        "p95_latency_ms": _percentile(latencies, 95),
+        "per_query": per_query
+    }
+
+def _percentile(values: List[float], pct: int) -> float:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def format_report(results: List[Dict], ks: List[int]) -> str:
+    """Render the results of several configurations as a comparison table"""
+    headers = ["config", "chunks"] + [f"Hit@{k}" for k in ks] + ["MRR", "tokens", "mean ms", "p95 ms"]
+    rows = []
+    for result in results:
+        rows.append(
+            [config_label(result["config"]), str(result["chunks_created"])]
+            + [f"{result['hit_at_k'][k]:.3f}" for k in ks]
+            + [
+                f"{result['mrr']:.3f}",
+                f"{result['mean_prompt_tokens']:.0f}",
+                f"{result['mean_latency_ms']:.2f}",
+                f"{result['p95_latency_ms']:.2f}"
+            ]
+        )
+
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in [headers] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Evaluate ContentStore retrieval quality and latency")
+    parser.add_argument("corpus", help="JSON file mapping URL -> document text")
+    parser.add_argument("labels", help="JSON file with labeled questions")
+    parser.add_argument("--config", action="append", default=[],
+                        help=f"Store settings to compare, e.g. chunk_size=500,chunk_overlap=100,scorer=jaccard "
+                             f"(scorers: {', '.join(SCORERS)}); repeat to compare several")
+    parser.add_argument("--k", type=int, action="append", default=[],
+                        help="Cut-offs for hit@k (default: 1, 3, 5)")
+    parser.add_argument("--max-chunks", type=int, default=3,
+                        help="Chunks included in the prompt, as in /query (default: 3)")
+    parser.add_argument("--json", dest="json_output", help="Also write full results, including per-query rows, to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.corpus, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+    with open(args.labels, 'r', encoding='utf-8') as f:
+        labels = json.load(f)
+
+    ks = sorted(set(args.k)) or [1, 3, 5]
+    if ks[0] < 1:
+        parser.error("--k must be at least 1")
+    if args.max_chunks < 1:
+        parser.error("--max-chunks must be at least 1")
+
+    try:
+        configs = [parse_config(spec) for spec in args.config] or [dict(DEFAULT_CONFIG)]
+        results = [evaluate_config(corpus, labels, config, ks, args.max_chunks) for config in configs]
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"📊 Evaluated {len(labels)} queries over {len(corpus)} documents")
+    if _get_encoding() is None:
+        print("ℹ️ tiktoken not installed, prompt tokens are estimated at ~4 characters per token")
+    print(format_report(results, ks))
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Full results written to {args.json_output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+import content_store
+from content_store import ContentStore, jaccard_score, keyword_overlap_score
+
+
+def test_keyword_overlap_score_counts_shared_words():
+    assert keyword_overlap_score({"massage", "price"}, {"massage", "costs", "80"}) == 1
+
+
+def test_jaccard_score():
+    assert jaccard_score({"a", "b"}, {"b", "c"}) == pytest.approx(1 / 3)
+    assert jaccard_score({"a"}, {"a"}) == 1
+    assert jaccard_score(set(), set()) == 0
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(0, 0), (100, -5), (100, 100), (100, 150)])
+def test_rejects_invalid_chunk_settings(tmp_path, chunk_size, chunk_overlap):
+    with pytest.raises(ValueError):
+        ContentStore(data_dir=str(tmp_path), chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def test_rejects_unknown_scorer(tmp_path):
+    with pytest.raises(ValueError):
+        ContentStore(data_dir=str(tmp_path), scorer="bm25")
+
+
+def test_large_overlap_terminates(tmp_path):
+    # A sentence break just past chunk_size - 200 used to move the next start backwards
+    text = ("y" * 100 + ". ") * 50
+    store = ContentStore(data_dir=str(tmp_path), chunk_size=300, chunk_overlap=250)
+
+    chunks = store._split_text_into_chunks(text, "doc")
+
+    assert chunks[-1]["end_pos"] >= len(text)
+    starts = [chunk["start_pos"] for chunk in chunks]
+    assert starts == sorted(set(starts))
+
+
+def test_large_overlap_without_sentence_breaks(tmp_path):
+    text = "x" * 5000
+    store = ContentStore(data_dir=str(tmp_path), chunk_size=300, chunk_overlap=250)
+
+    chunks = store._split_text_into_chunks(text, "doc")
+
+    assert chunks[-1]["end_pos"] >= len(text)
+    assert all(len(chunk["content"]) <= 300 for chunk in chunks)
+    assert all(b["start_pos"] - a["start_pos"] == 50 for a, b in zip(chunks, chunks[1:]))
+
+
+def test_construction_does_not_touch_filesystem(tmp_path):
+    ContentStore(data_dir=str(tmp_path / "data"))
+
+    assert not (tmp_path / "data").exists()
+
+
+def test_corrupt_storage_file_is_parsed_once(tmp_path):
+    (tmp_path / "scraped_content.json").write_text("{not json", encoding="utf-8")
+    store = ContentStore(data_dir=str(tmp_path))
+
+    assert store.warm_up() == {"urls_loaded": 0, "chunks_loaded": 0}
+    assert store.is_loaded
+
+    store.store_content("doc", "Haircuts cost 40 dollars.")
+    assert ContentStore(data_dir=str(tmp_path)).get_content("doc")["chunks_count"] == 1
+
+
+def test_stores_sharing_a_directory_see_each_others_writes(tmp_path):
+    writer = ContentStore(data_dir=str(tmp_path))
+    reader = ContentStore(data_dir=str(tmp_path))
+
+    writer.store_content("x", "Haircuts cost 40 dollars.")
+    reader.warm_up()
+    writer.store_content("y", "Massages cost 80 dollars.")
+
+    assert reader.get_content("y")["url"] == "y"
+    # Reading updates last_accessed and saves, which must not drop the other store's content
+    reader.get_content("x")
+    assert ContentStore(data_dir=str(tmp_path)).get_storage_stats()["total_urls"] == 2
+
+
+def test_failed_save_does_not_update_cache(tmp_path, monkeypatch):
+    store = ContentStore(data_dir=str(tmp_path))
+    store.store_content("x", "Haircuts cost 40 dollars.")
+
+    def failing_dump(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(content_store.json, "dump", failing_dump)
+    store.store_content("y", "Massages cost 80 dollars.")
+    monkeypatch.undo()
+
+    assert store.get_content("y") is None
+    assert store.get_content("x") is not None
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
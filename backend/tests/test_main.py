@@ -0,0 +1,116 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from content_store import content_store
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_SECONDS = "2.0"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # The global store uses a relative data directory
+    monkeypatch.chdir(tmp_path)
+    content_store._data = None
+    yield TestClient(main.app)
+    content_store._data = None
+
+
+def wait_until_ready(client, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = client.get("/health/ready")
+        if response.status_code == 200:
+            return response
+        time.sleep(0.01)
+    pytest.fail("Content index did not become ready")
+
+
+def run_startup_script(tmp_path, script):
+    """Run a script in a fresh interpreter so imports and timings are not shared with pytest"""
+    # Pin the budget so a value from the shell or a .env file can't change what is checked
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR, STARTUP_BUDGET_SECONDS=STARTUP_BUDGET_SECONDS)
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env,
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_heavy_dependencies(tmp_path):
+    loaded = run_startup_script(tmp_path, (
+        "import json, sys, main\n"
+        "print(json.dumps([m for m in ('openai', 'requests', 'bs4', 'aiohttp') if m in sys.modules]))"
+    ))
+
+    assert loaded == []
+    assert not (tmp_path / "data").exists()
+
+
+def test_startup_within_budget(tmp_path):
+    health = run_startup_script(tmp_path, (
+        "import json, main\n"
+        "from fastapi.testclient import TestClient\n"
+        "with TestClient(main.app) as client:\n"
+        "    print(json.dumps(client.get('/health').json()))"
+    ))
+
+    assert health["startup"]["budget_seconds"] == float(STARTUP_BUDGET_SECONDS)
+    assert health["startup"]["startup_seconds"] is not None
+    assert health["startup"]["within_budget"] is True
+
+
+def test_ready_after_warm_up(client, monkeypatch):
+    loaded = threading.Event()
+    warm_up = content_store.warm_up
+
+    def gated_warm_up():
+        loaded.wait(5)
+        return warm_up()
+
+    monkeypatch.setattr(content_store, "warm_up", gated_warm_up)
+
+    with client:
+        try:
+            assert client.get("/health/live").status_code == 200
+            assert client.get("/health/ready").status_code == 503
+            assert client.get("/storage-stats").status_code == 503
+            health = client.get("/health").json()
+            assert health["status"] == "starting"
+            assert health["ready"] is False
+        finally:
+            loaded.set()
+
+        assert wait_until_ready(client).json()["index"] == {"urls_loaded": 0, "chunks_loaded": 0}
+        assert client.get("/storage-stats").json()["total_urls"] == 0
+        health = client.get("/health").json()
+        assert health["status"] == "healthy"
+        assert health["storage_stats"]["total_urls"] == 0
+
+
+def test_warm_up_failure_reported(client, monkeypatch):
+    def failing_warm_up():
+        raise PermissionError("storage file not readable")
+
+    monkeypatch.setattr(content_store, "warm_up", failing_warm_up)
+
+    with client:
+        deadline = time.monotonic() + 5
+        while client.get("/health").json()["status"] == "starting" and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        health = client.get("/health").json()
+        assert health["status"] == "unhealthy"
+        assert "storage file not readable" in health["message"]
+        assert client.get("/health/live").status_code == 200
+        assert client.get("/health/ready").status_code == 503
+        assert client.get("/storage-stats").status_code == 503
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from retrieval_eval import evaluate_config, is_relevant, main, parse_config
+
+
+def test_is_relevant_matches_answer_span_or_chunk_id():
+    chunk = {"content": "Open Mon-Fri\n  9am-7pm.", "chunk_id": 2}
+
+    assert is_relevant(chunk, {"answer": "mon-fri 9am-7pm"})
+    assert is_relevant(chunk, {"answer": "Sunday", "chunk_ids": [2]})
+    assert not is_relevant(chunk, {"answer": "Sunday", "chunk_ids": [0, 1]})
+
+
+def test_parse_config():
+    assert parse_config("chunk_size=500,scorer=jaccard") == {
+        "chunk_size": 500, "chunk_overlap": 200, "scorer": "jaccard"
+    }
+    with pytest.raises(ValueError):
+        parse_config("window=5")
+
+
+def test_evaluate_config_metrics():
+    # Each document fits in a single chunk, so ranking is fully determined by the scorer
+    corpus = {
+        "a": "haircut costs 40 dollars",
+        "b": "massage costs 80 dollars. haircut styles vary",
+    }
+    labels = [
+        # Relevant chunk is the only one retrieved: rank 1
+        {"question": "massage price", "url": "b", "answer": "massage costs 80"},
+        # Retrieved but the answer is not there: miss
+        {"question": "haircut price", "url": "a", "answer": "30 dollars"},
+        # Nothing matches the query: miss, and no prompt is sent
+        {"question": "parking", "url": "a", "answer": "haircut"},
+    ]
+
+    result = evaluate_config(corpus, labels, parse_config(""), ks=[1, 3])
+
+    assert result["queries"] == 3
+    assert result["hit_at_k"] == {1: pytest.approx(1 / 3), 3: pytest.approx(1 / 3)}
+    assert result["mrr"] == pytest.approx(1 / 3)
+    assert [q["first_relevant_rank"] for q in result["per_query"]] == [1, None, None]
+    assert result["per_query"][2]["prompt_tokens"] == 0
+    assert result["per_query"][0]["prompt_tokens"] > 0
+
+
+def test_evaluate_config_mrr_uses_first_relevant_rank():
+    # One sentence per chunk, scored by how many query words each contains
+    corpus = {"doc": "Alpha is the answer here. Alpha beta filler. Alpha beta gamma filler."}
+    labels = [{"question": "alpha beta gamma", "answer": "the answer"}]
+
+    result = evaluate_config(corpus, labels, parse_config("chunk_size=30,chunk_overlap=0"), ks=[1, 2, 3])
+
+    assert result["chunks_created"] == 3
+    assert result["per_query"][0]["first_relevant_rank"] == 3
+    assert result["hit_at_k"] == {1: 0, 2: 0, 3: 1}
+    assert result["mrr"] == pytest.approx(1 / 3)
+
+
+def test_evaluate_config_requires_url_for_multi_document_corpus():
+    with pytest.raises(ValueError, match="'url' required"):
+        evaluate_config(
+            {"a": "text", "b": "more text"}, [{"question": "text", "answer": "text"}], parse_config(""), ks=[1]
+        )
+
+
+@pytest.mark.parametrize("label, problem", [
+    ({"question": "text", "url": "c", "answer": "text"}, "'url' not in corpus"),
+    ({"question": "text", "url": "a"}, "missing both 'answer' and 'chunk_ids'"),
+    ({"url": "a", "answer": "text"}, "missing 'question'"),
+])
+def test_evaluate_config_rejects_bad_labels(label, problem):
+    labels = [{"question": "ok", "url": "a", "answer": "text"}, label]
+
+    with pytest.raises(ValueError, match=problem) as excinfo:
+        evaluate_config({"a": "text", "b": "more text"}, labels, parse_config(""), ks=[1])
+
+    assert "#1" in str(excinfo.value)
+    assert "#0" not in str(excinfo.value)
+
+
+@pytest.mark.parametrize("args", [["--k", "0"], ["--k", "-1"], ["--max-chunks", "0"]])
+def test_main_rejects_cut_offs_below_one(tmp_path, args):
+    corpus = tmp_path / "corpus.json"
+    labels = tmp_path / "labels.json"
+    corpus.write_text(json.dumps({"a": "text"}), encoding="utf-8")
+    labels.write_text(json.dumps([{"question": "text", "answer": "text"}]), encoding="utf-8")
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(corpus), str(labels)] + args)
+
+    assert excinfo.value.code == 2
+
+
+def test_main_reports_bad_labels_as_usage_error(tmp_path, capsys):
+    corpus = tmp_path / "corpus.json"
+    labels = tmp_path / "labels.json"
+    corpus.write_text(json.dumps({"a": "text"}), encoding="utf-8")
+    labels.write_text(json.dumps([{"answer": "text"}]), encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        main([str(corpus), str(labels)])
+
+    assert "missing 'question'" in capsys.readouterr().err